@@ -8,18 +8,121 @@ Supports topic-based groups (forums).
 import os
 import sys
 import asyncio
+import collections
+import concurrent.futures
+import functools
+import itertools
 import logging
+import logging.handlers
+import pickle
+import queue
+import re
+import sqlite3
+import time
 from pathlib import Path
-from datetime import datetime
 from configparser import ConfigParser
-from telethon import TelegramClient, events
-from telethon.tl.types import MessageMediaDocument, MessageMediaPhoto, UpdateMessageReactions
+
+# Telethon imports are deferred into the methods that need them: pulling
+# in its TL type tree costs hundreds of milliseconds, which config-error
+# and --help style invocations shouldn't pay
+
+# Our log format uses none of the thread/process/caller fields, so skip
+# collecting them for every record (caller lookup costs a stack walk)
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging._srcfile = None
+
+# Translation table mapping filesystem-unsafe characters to underscores
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+_MB = 1024 * 1024
+
+# Video containers worth handing to Sonarr after download
+_VIDEO_EXTS = frozenset({'.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v'})
+
+# Strips U+FE0F (variation selector-16), which makes ❤️ differ from ❤
+_VS16_TABLE = str.maketrans('', '', '\uFE0F')
+
+# t.me message links - public channels and private (t.me/c/...) ones
+_PUBLIC_LINK_RE = re.compile(r'https?://t\.me/([^/c][^/]*)/(\d+)')
+_PRIVATE_LINK_RE = re.compile(r'https?://t\.me/c/(\d+)/(\d+)')
+
+# Counter appended to generated filenames so media arriving in the same
+# instant can never collide
+_name_counter = itertools.count()
+
+
+def _generated_name(prefix, ext):
+    """Build a unique filename for media without an original name"""
+    return f"{prefix}_{time.time_ns()}_{next(_name_counter)}.{ext}"
 
 
 class TelegramDownloader:
+    # One long-lived instance reaches into these attributes constantly
+    # from the event handlers; __slots__ removes the per-instance
+    # __dict__ and makes every lookup a fixed-offset read
+    __slots__ = (
+        'config', 'api_id', 'api_hash', 'phone',
+        'monitored_chats', '_monitored_usernames', '_monitored_ids',
+        '_monitored_peer_ids',
+        'download_path', 'reaction_emoji', '_normalized_emoji',
+        'file_extensions', 'max_file_size', 'max_concurrent',
+        'parallel_connections', 'chunk_size',
+        'sonarr_enabled', 'sonarr_url', 'sonarr_api_key',
+        '_pending_sonarr_scans', '_http_session',
+        'notification_chat', '_notification_queue', '_notification_task',
+        'link_download_enabled', 'link_chat',
+        'logger', '_log_listener',
+        'client', '_seen_db', 'downloaded_messages', '_existing_files',
+        '_active_filenames',
+        'download_semaphore', '_chat_semaphores', 'chunk_semaphore',
+        'download_tasks', '_finalize_pool',
+        '_entity_cache', '_pending_fetches', '_fetch_flush_task',
+        '_me', 'my_id',
+    )
+
+    @staticmethod
+    @functools.cache
+    def _load_config(config_path):
+        """Parse the config file once per path and reuse the result
+
+        A pickled snapshot keyed on the ini's mtime and size is kept next
+        to it, so later process starts load the parsed sections with one
+        pickle.load instead of running the ini tokenizer again.
+        """
+        config = ConfigParser()
+        cache_path = f"{config_path}.cache"
+
+        try:
+            stat = os.stat(config_path)
+            cache_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_key = None
+
+        if cache_key is not None:
+            try:
+                with open(cache_path, 'rb') as cache_file:
+                    stored_key, sections = pickle.load(cache_file)
+                if stored_key == cache_key:
+                    config.read_dict(sections)
+                    return config
+            except (OSError, pickle.PickleError, EOFError, ValueError):
+                pass  # Stale or unreadable cache, fall through to a parse
+
+        config.read(config_path)
+
+        if cache_key is not None:
+            sections = {section: dict(config[section]) for section in config.sections()}
+            try:
+                with open(cache_path, 'wb') as cache_file:
+                    pickle.dump((cache_key, sections), cache_file)
+            except OSError:
+                pass  # Read-only config dir, caching is best-effort
+        return config
+
     def __init__(self, config_path='config.ini'):
-        self.config = ConfigParser()
-        self.config.read(config_path)
+        self.config = self._load_config(config_path)
         
         # Telegram credentials
         self.api_id = self.config.get('Telegram', 'api_id')
@@ -29,15 +132,33 @@ class TelegramDownloader:
         # Monitored chats
         monitored = self.config.get('Telegram', 'monitored_chats', fallback='')
         self.monitored_chats = [chat.strip() for chat in monitored.split(',') if chat.strip()]
+
+        # Pre-split the monitored list into username and numeric-ID sets so
+        # the per-event check is an O(1) membership test
+        self._monitored_usernames = frozenset(
+            chat[1:].lower() for chat in self.monitored_chats if chat.startswith('@'))
+        self._monitored_ids = frozenset(
+            int(chat.lstrip('-')) for chat in self.monitored_chats if chat.lstrip('-').isdigit())
         
         # Download settings
         self.download_path = Path(self.config.get('Download', 'download_path'))
         self.reaction_emoji = self.config.get('Download', 'reaction_emoji', fallback='❤️')
-        self.file_extensions = [ext.strip() for ext in 
-                               self.config.get('Download', 'file_extensions').split(',') 
-                               if ext.strip()]
-        self.max_file_size = self.config.getint('Download', 'max_file_size_mb') * 1024 * 1024
-        self.max_concurrent = self.config.getint('Download', 'max_concurrent_downloads', fallback=2)
+        self._normalized_emoji = self._normalize_emoji(self.reaction_emoji)
+        # Normalized to lowercase dot-prefixed form so entries like "mp4"
+        # and ".MP4" both match the computed suffix
+        self.file_extensions = frozenset(
+            ext if ext.startswith('.') else '.' + ext
+            for ext in (raw.strip().lower() for raw in
+                        self.config.get('Download', 'file_extensions').split(','))
+            if ext)
+        self.max_file_size = self.config.getint('Download', 'max_file_size_mb') * _MB
+        self.max_concurrent = self.config.getint('Download', 'max_concurrent_downloads', fallback=8)
+        self.parallel_connections = self.config.getint('Download', 'parallel_connections', fallback=4)
+        # upload.getFile only accepts request sizes that divide 1 MiB
+        # evenly, i.e. powers of two between 4 KiB and 1 MiB - anything
+        # else gets LIMIT_INVALID, so round odd values down to one
+        chunk_kb = self.config.getint('Download', 'download_chunk_size_kb', fallback=1024)
+        self.chunk_size = 1 << (max(4096, min(chunk_kb * 1024, _MB)).bit_length() - 1)
         
         # Sonarr settings
         self.sonarr_enabled = self.config.getboolean('Sonarr', 'enabled', fallback=False)
@@ -56,27 +177,93 @@ class TelegramDownloader:
         
         # Create download directory if it doesn't exist
         self.download_path.mkdir(parents=True, exist_ok=True)
+
+        # Cache the names of already-downloaded files so the common
+        # "not downloaded yet" path avoids a stat() per message. Partial
+        # .part files don't count as downloaded
+        self._existing_files = set(
+            name for name in os.listdir(self.download_path) if not name.endswith('.part'))
+        # Filenames with a download currently in flight. The seen-id guard
+        # is keyed on (peer, msg), so two different messages carrying the
+        # same document name would otherwise race for one .part path
+        self._active_filenames = set()
         
-        # Initialize Telegram client
-        self.client = TelegramClient('telegram_session', self.api_id, self.api_hash)
+        # Initialize Telegram client. Retry settings keep reconnects cheap,
+        # and flood_sleep_threshold lets short FloodWaits be slept through
+        # instead of raising mid-download
+        from telethon import TelegramClient
+        self.client = TelegramClient(
+            'telegram_session', self.api_id, self.api_hash,
+            connection_retries=5,
+            retry_delay=1,
+            flood_sleep_threshold=60)
         
-        # Track downloaded messages to avoid duplicates
-        self.downloaded_messages = set()
+        # Track downloaded messages to avoid duplicates. The set is the
+        # in-memory fast path; the SQLite table persists across restarts
+        self._seen_db = sqlite3.connect(self.download_path / '.seen.db', isolation_level=None)
+        self._seen_db.execute('PRAGMA journal_mode=WAL')
+        self._seen_db.execute('PRAGMA synchronous=NORMAL')
+        self._seen_db.execute(
+            'CREATE TABLE IF NOT EXISTS seen '
+            '(peer INTEGER, msg INTEGER, PRIMARY KEY (peer, msg)) WITHOUT ROWID')
+        self.downloaded_messages = set(self._seen_db.execute('SELECT peer, msg FROM seen'))
         
-        # Download queue and semaphore for concurrent downloads
-        self.download_queue = asyncio.Queue()
+        # Semaphores for concurrent downloads. The global one caps total
+        # transfers; the per-chat ones keep a single busy channel from
+        # starving everything else
         self.download_semaphore = asyncio.Semaphore(self.max_concurrent)
-        self.active_downloads = 0
+        self._chat_semaphores = {}
+
+        # Keep references to in-flight download tasks so they aren't
+        # garbage-collected mid-download and can be drained on shutdown
+        self.download_tasks = set()
+
+        # Telegram rate-limits around 10 parallel file operations per client,
+        # so cap the total number of in-flight chunk streams process-wide
+        self.chunk_semaphore = asyncio.BoundedSemaphore(10)
+
+        # Post-download work (verification, future hashing/moves) runs in
+        # this small pool so it never blocks the event loop
+        self._finalize_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix='finalize')
+
+        # Shared aiohttp session for Sonarr calls, created lazily so
+        # aiohttp stays an optional dependency
+        self._http_session = None
+
+        # Directories that already have a Sonarr scan scheduled, so an
+        # album finishing in a burst triggers one scan instead of N
+        self._pending_sonarr_scans = set()
+
+        # Notifications queued for the debounced batch sender
+        self._notification_queue = []
+        self._notification_task = None
         
-        # Store my user ID for checking reactions
+        # Cache resolved chat entities so repeat lookups of the same chat
+        # don't cost a get_entity round trip each time. Ordered so the
+        # least recently used entry can be evicted once the cache is full
+        self._entity_cache = collections.OrderedDict()
+
+        # Message fetches queued for batching: chat_id -> (chat, {msg_id: Future})
+        self._pending_fetches = {}
+        self._fetch_flush_task = None
+
+        # Numeric peer IDs used to drop raw events from unmonitored chats
+        # before any other work; filled in at start() once usernames in
+        # monitored_chats have been resolved
+        self._monitored_peer_ids = frozenset()
+
+        # Store my user entity/ID for checking reactions
+        self._me = None
         self.my_id = None
         
         self.logger.info(f"Telegram Downloader initialized")
         self.logger.info(f"Download path: {self.download_path}")
         self.logger.info(f"Reaction emoji: {self.reaction_emoji}")
         self.logger.info(f"Max concurrent downloads: {self.max_concurrent}")
+        self.logger.info(f"Parallel connections per download: {self.parallel_connections}")
         self.logger.info(f"Monitored chats: {self.monitored_chats if self.monitored_chats else 'ALL'}")
-        self.logger.info(f"File extensions filter: {self.file_extensions if self.file_extensions else 'ALL'}")
+        self.logger.info(f"File extensions filter: {sorted(self.file_extensions) if self.file_extensions else 'ALL'}")
         
         if self.sonarr_enabled:
             self.logger.info(f"Sonarr integration: ENABLED ({self.sonarr_url})")
@@ -96,74 +283,223 @@ class TelegramDownloader:
         self.logger = logging.getLogger('TelegramDownloader')
         self.logger.setLevel(getattr(logging, log_level))
         
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, log_level))
-        console_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(console_format)
-        self.logger.addHandler(console_handler)
+        console_handler.setFormatter(formatter)
+        handlers = [console_handler]
         
-        # File handler (if specified)
+        # Rotating file handler (if specified); delay=True postpones
+        # opening the file until the first record
         if log_file:
-            file_handler = logging.FileHandler(log_file)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=10 << 20, backupCount=3, delay=True)
             file_handler.setLevel(getattr(logging, log_level))
-            file_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            file_handler.setFormatter(file_format)
-            self.logger.addHandler(file_handler)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+
+        # The event loop only enqueues records; formatting and disk/console
+        # writes happen on the listener's background thread
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True)
+        self._log_listener.start()
     
-    def _should_download(self, filename, file_size):
-        """Check if file should be downloaded based on filters"""
+    @staticmethod
+    def _peer_id(peer):
+        """Extract the numeric ID from a Peer{Channel,Chat,User} object"""
+        return (getattr(peer, 'channel_id', None)
+                or getattr(peer, 'chat_id', None)
+                or getattr(peer, 'user_id', None)
+                or 0)
+
+    def _message_key(self, peer, msg_id):
+        """Build the (peer_id, msg_id) key used for duplicate tracking"""
+        return (self._peer_id(peer), msg_id)
+
+    _ENTITY_CACHE_SIZE = 512
+
+    async def _get_me(self):
+        """Return my own user, fetching it from Telegram only once"""
+        if self._me is None:
+            self._me = await self.client.get_me()
+        return self._me
+
+    async def _get_cached_entity(self, peer):
+        """Resolve a peer, username or numeric ID to its entity
+
+        Results are kept in a small LRU cache so repeated lookups of the
+        same chat (reactions, links, notifications) cost a dict hit
+        instead of an RPC.
+        """
+        key = self._peer_id(peer) or peer
+        entity = self._entity_cache.get(key)
+        if entity is not None:
+            self._entity_cache.move_to_end(key)
+            return entity
+
+        entity = await self.client.get_entity(peer)
+        self._entity_cache[key] = entity
+        if len(self._entity_cache) > self._ENTITY_CACHE_SIZE:
+            self._entity_cache.popitem(last=False)
+        return entity
+
+    def _mark_downloaded(self, message_key):
+        """Record a successfully downloaded message in memory and on disk"""
+        self.downloaded_messages.add(message_key)
+        self._seen_db.execute('INSERT OR IGNORE INTO seen (peer, msg) VALUES (?, ?)', message_key)
+
+    def _log_error(self, message, error):
+        """Log an error, formatting the full traceback only under DEBUG
+
+        Building a traceback costs hundreds of microseconds per record;
+        at INFO level a one-line summary of the exception is enough.
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.error(f"{message}: {error}", exc_info=True)
+        else:
+            self.logger.error(f"{message}: {error!r}")
+
+    def _should_download(self, filename, file_size, suffix=None):
+        """Check if file should be downloaded based on filters
+
+        The caller may pass the already-computed lowercase suffix to
+        avoid re-parsing the filename.
+        """
         # Check file size limit
         if self.max_file_size > 0 and file_size > self.max_file_size:
-            self.logger.info(f"Skipping {filename}: exceeds size limit ({file_size / (1024*1024):.2f} MB)")
+            self.logger.info(f"Skipping {filename}: exceeds size limit ({file_size / _MB:.2f} MB)")
             return False
         
-        # Check file extension
+        # Check file extension (rpartition avoids building a Path object)
         if self.file_extensions:
-            ext = Path(filename).suffix.lower()
-            if ext not in self.file_extensions:
-                self.logger.debug(f"Skipping {filename}: extension {ext} not in filter list")
+            if suffix is None:
+                _, sep, tail = filename.rpartition('.')
+                suffix = ('.' + tail.lower()) if sep else ''
+            if suffix not in self.file_extensions:
+                self.logger.debug("Skipping %s: extension %s not in filter list", filename, suffix)
                 return False
         
         return True
     
     def _sanitize_filename(self, filename):
         """Sanitize filename to remove problematic characters"""
-        # Replace problematic characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        return filename
+        # Single C-level pass instead of one replace() per character
+        return filename.translate(_SANITIZE_TABLE)
     
+    _NOTIFICATION_DEBOUNCE = 2.0
+
     async def send_notification(self, message):
-        """Send notification to configured chat"""
+        """Queue a notification for the configured chat
+
+        Notifications arriving within a short window (e.g. the three
+        messages a download produces, times ten for an album) are joined
+        into a single send_message RPC instead of one each.
+        """
         if not self.notification_chat:
             return
         
-        try:
-            # Get notification chat entity
-            if self.notification_chat.lower() == 'me':
-                chat = 'me'
-            elif self.notification_chat.lstrip('-').isdigit():
-                # Numeric chat ID
-                chat_id = int(self.notification_chat)
-                chat = await self.client.get_entity(chat_id)
-            else:
-                # Username or channel
-                chat = await self.client.get_entity(self.notification_chat)
-            
-            await self.client.send_message(chat, message)
-        except Exception as e:
-            self.logger.error(f"Failed to send notification: {e}")
+        self._notification_queue.append(message)
+        if self._notification_task is None or self._notification_task.done():
+            self._notification_task = self._spawn(self._flush_notifications())
+
+    async def _flush_notifications(self):
+        """Send everything queued once the debounce window closes
+
+        Loops while the queue refills: a notification queued while
+        send_message is in flight sees this task as still running and
+        doesn't spawn a new flush, so it must be drained here or it
+        would sit in the queue until the next notification.
+        """
+        while self._notification_queue:
+            await asyncio.sleep(self._NOTIFICATION_DEBOUNCE)
+            batch, self._notification_queue = self._notification_queue, []
+
+            try:
+                # Get notification chat entity
+                if self.notification_chat.lower() == 'me':
+                    chat = 'me'
+                elif self.notification_chat.lstrip('-').isdigit():
+                    # Numeric chat ID
+                    chat = await self._get_cached_entity(int(self.notification_chat))
+                else:
+                    # Username or channel
+                    chat = await self._get_cached_entity(self.notification_chat)
+
+                # Stay under Telegram's 4096-character message limit
+                text = ''
+                for entry in batch:
+                    if text and len(text) + len(entry) + 2 > 4000:
+                        await self.client.send_message(chat, text)
+                        text = entry
+                    else:
+                        text = f"{text}\n\n{entry}" if text else entry
+                if text:
+                    await self.client.send_message(chat, text)
+            except Exception as e:
+                self.logger.error(f"Failed to send notification: {e}")
     
+    async def _http(self):
+        """Return the shared aiohttp session, creating it on first use
+
+        Reusing one session keeps the TCP (and TLS) connection to Sonarr
+        alive between calls instead of re-handshaking every time.
+        """
+        import aiohttp
+
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=15, connect=5),
+                connector=aiohttp.TCPConnector(
+                    limit=4,
+                    limit_per_host=2,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True),
+                headers={'Connection': 'keep-alive'})
+        return self._http_session
+
+    async def aclose(self):
+        """Release network resources not owned by the Telegram client"""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+
+    _SONARR_SCAN_DELAY = 5.0
+
+    def _schedule_sonarr_scan(self, file_path):
+        """Trigger a debounced Sonarr scan of the file's directory
+
+        Sonarr's DownloadedEpisodesScan rescans a whole directory, so
+        back-to-back completions in the same directory are coalesced
+        into a single delayed command.
+        """
+        directory = str(file_path.parent)
+        if directory in self._pending_sonarr_scans:
+            return
+        self._pending_sonarr_scans.add(directory)
+
+        # Tracked so shutdown drains it too
+        self._spawn(self._run_sonarr_scan(file_path))
+
+    async def _run_sonarr_scan(self, file_path):
+        """Wait out the debounce window, then issue the scan command"""
+        try:
+            await asyncio.sleep(self._SONARR_SCAN_DELAY)
+        finally:
+            # Clear before scanning so files landing during the scan
+            # schedule a fresh one
+            self._pending_sonarr_scans.discard(str(file_path.parent))
+        await self.import_to_sonarr(file_path)
+
     async def import_to_sonarr(self, file_path):
         """Import a downloaded file to Sonarr"""
         if not self.sonarr_enabled or not self.sonarr_url or not self.sonarr_api_key:
             return False
         
         try:
-            import aiohttp
-            
             # Sonarr Manual Import API
             url = f"{self.sonarr_url}/api/v3/command"
             headers = {
@@ -176,165 +512,358 @@ class TelegramDownloader:
                 "path": str(file_path.parent)  # Scan the directory
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 201:
-                        self.logger.info(f"✓ Triggered Sonarr import for: {file_path.name}")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        self.logger.error(f"Sonarr import failed ({response.status}): {error_text}")
-                        return False
+            session = await self._http()
+            async with session.post(url, headers=headers, json=payload) as response:
+                if response.status == 201:
+                    self.logger.info(f"✓ Triggered Sonarr import for: {file_path.name}")
+                    return True
+                else:
+                    error_text = await response.text()
+                    self.logger.error(f"Sonarr import failed ({response.status}): {error_text}")
+                    return False
         
         except ImportError:
             self.logger.warning("aiohttp not installed - Sonarr integration disabled. Install with: pip install aiohttp")
             self.sonarr_enabled = False
             return False
         except Exception as e:
-            self.logger.error(f"Error importing to Sonarr: {e}", exc_info=True)
+            self._log_error("Error importing to Sonarr", e)
             return False
     
+    _PART_STALE_AFTER = 60.0
+
+    async def _parallel_download(self, message, file_path, file_size):
+        """Download a file by fetching several chunk streams in parallel
+
+        Telethon's download_media fetches parts serially over a single
+        connection. This splits the file into interleaved stripes and
+        downloads them concurrently into a pre-allocated .part file,
+        then renames it into place once all stripes complete.
+        """
+        chunk_size = self.chunk_size
+        total_chunks = (file_size + chunk_size - 1) // chunk_size
+        workers = max(1, min(self.parallel_connections, total_chunks))
+
+        part_path = str(file_path) + '.part'
+        try:
+            # O_EXCL makes creation atomic, so two racing downloads of the
+            # same file can't interleave writes into one .part
+            fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            # A live striped download touches its .part on every write, so
+            # a fresh mtime means someone (e.g. a second instance pointed
+            # at the same directory) is still writing it - only reap
+            # leftovers whose writes stopped long ago
+            try:
+                mtime = os.stat(part_path).st_mtime
+            except FileNotFoundError:
+                mtime = 0.0
+            if time.time() - mtime < self._PART_STALE_AFTER:
+                raise
+            try:
+                os.unlink(part_path)
+            except FileNotFoundError:
+                pass
+            fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+
+        async def download_stripe(index):
+            """Download every workers-th chunk starting at chunk `index`"""
+            async with self.chunk_semaphore:
+                pos = index * chunk_size
+                async for data in self.client.iter_download(
+                        message.media,
+                        offset=index * chunk_size,
+                        stride=workers * chunk_size,
+                        request_size=chunk_size,
+                        file_size=file_size):
+                    # pwrite blocks the event loop on slow disks (NFS/SMB),
+                    # so hand it to the default thread pool
+                    await asyncio.to_thread(os.pwrite, fd, data, pos)
+                    pos += workers * chunk_size
+
+        stripes = []
+        try:
+            # Hint the kernel that this is a one-shot bulk write so the page
+            # cache doesn't hold completed media at the expense of other I/O.
+            # The advice values are enums, not flags, so each hint needs its
+            # own call; both are purely advisory, so failures are ignored
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_NOREUSE)
+                except OSError:
+                    pass
+            os.ftruncate(fd, file_size)
+            stripes = [asyncio.create_task(download_stripe(i)) for i in range(workers)]
+            await asyncio.gather(*stripes)
+        except Exception:
+            # gather doesn't cancel the sibling stripes when one fails;
+            # stop and await them before closing the fd, or a surviving
+            # stripe would pwrite into a closed (and, once another
+            # download reuses the number, recycled) descriptor
+            for stripe in stripes:
+                stripe.cancel()
+            await asyncio.gather(*stripes, return_exceptions=True)
+            os.close(fd)
+            # Leave no half-written file behind
+            try:
+                os.unlink(part_path)
+            except OSError:
+                pass
+            raise
+
+        os.close(fd)
+        os.replace(part_path, str(file_path))
+
     async def _process_link_message(self, target_message, target_channel, target_chat_title, channel_ref, msg_id):
         """Process a message from a link (handles single files and media groups)"""
         # Check if it's a media group
-        if hasattr(target_message, 'grouped_id') and target_message.grouped_id:
+        if getattr(target_message, 'grouped_id', None):
             self.logger.info(f"Link points to media group (grouped_id: {target_message.grouped_id})")
             
-            # Find all messages in the group
-            min_id = max(1, int(msg_id) - 50)
-            max_id = int(msg_id) + 50
-            
-            grouped_messages = []
-            async for msg in self.client.iter_messages(target_channel, min_id=min_id, max_id=max_id, limit=None):
-                if hasattr(msg, 'grouped_id') and msg.grouped_id == target_message.grouped_id:
-                    grouped_messages.append(msg)
-            
-            grouped_messages.sort(key=lambda m: m.id)
+            # Find all messages in the group with one batched fetch
+            grouped_messages = await self._fetch_album(
+                target_channel, int(msg_id), target_message.grouped_id)
             self.logger.info(f"Found {len(grouped_messages)} files in group")
             
             # Download all
             for msg in grouped_messages:
-                asyncio.create_task(self.download_media(msg, target_chat_title))
+                self._spawn(self.download_media(msg, target_chat_title))
         else:
             # Single message
-            asyncio.create_task(self.download_media(target_message, target_chat_title))
+            self._spawn(self.download_media(target_message, target_chat_title))
         
         await self.send_notification(f"📎 Started download from link:\nt.me/{channel_ref}/{msg_id}")
     
     def _normalize_emoji(self, emoji):
         """Normalize emoji by removing variation selectors"""
-        # Remove U+FE0F (variation selector-16) which makes ❤️ vs ❤
-        return emoji.replace('\uFE0F', '')
+        return emoji.translate(_VS16_TABLE)
     
-    def _has_my_reaction(self, reactions, emoji):
-        """Check if I have reacted with the specified emoji"""
+    def _has_my_reaction(self, reactions):
+        """Check if I have reacted with the configured emoji"""
         try:
             if not reactions or not reactions.results:
                 return False
             
-            # Normalize the target emoji
-            normalized_target = self._normalize_emoji(emoji)
-            self.logger.info(f"  Looking for normalized: {repr(normalized_target)} (from {repr(emoji)})")
-            
+            # Target emoji is normalized once in __init__
+            normalized_target = self._normalized_emoji
+
             # Check each reaction
             for reaction in reactions.results:
-                # Check if this is the emoji we're looking for
-                if hasattr(reaction.reaction, 'emoticon'):
-                    reaction_emoji = reaction.reaction.emoticon
-                    normalized_reaction = self._normalize_emoji(reaction_emoji)
-                    self.logger.info(f"  Comparing with: {repr(normalized_reaction)} (from {repr(reaction_emoji)})")
-                    
-                    if normalized_reaction == normalized_target:
-                        # Check if chosen_order exists (0 or positive number means we reacted)
-                        # None means we didn't react
-                        if hasattr(reaction, 'chosen_order') and reaction.chosen_order is not None:
-                            self.logger.info(f"  ✓ Match! chosen_order: {reaction.chosen_order}")
-                            return True
-            
+                # chosen_order is only set on reactions *we* picked
+                # (0 or positive number means we reacted, None means we didn't)
+                if getattr(reaction, 'chosen_order', None) is None:
+                    continue
+
+                # Custom emoji reactions have no emoticon attribute
+                reaction_emoji = getattr(reaction.reaction, 'emoticon', None)
+                if reaction_emoji is None:
+                    continue
+
+                # Exact match first; only normalize when the raw string
+                # differs (i.e. it carries a variation selector)
+                if (reaction_emoji == normalized_target
+                        or self._normalize_emoji(reaction_emoji) == normalized_target):
+                    self.logger.debug(f"  ✓ Match! chosen_order: {reaction.chosen_order}")
+                    return True
+
             return False
             
         except Exception as e:
             self.logger.error(f"Error checking reactions: {e}")
             return False
     
-    async def download_media(self, message, chat_title):
+    def _spawn(self, coro):
+        """Create a background task that is tracked until it finishes
+
+        Holding a reference protects the task from being garbage
+        collected mid-flight, and shutdown drains the set so nothing is
+        cut off when the client disconnects.
+        """
+        task = asyncio.create_task(coro)
+        self.download_tasks.add(task)
+        task.add_done_callback(self.download_tasks.discard)
+        return task
+
+    async def _fetch_album(self, chat, msg_id, grouped_id):
+        """Fetch all messages of an album in a single RPC
+
+        Albums hold at most 10 items with adjacent message IDs, so asking
+        for the nine neighbours on each side in one get_messages call
+        covers the whole group without a message-range scan.
+        """
+        ids = list(range(max(1, msg_id - 9), msg_id + 10))
+        messages = await self.client.get_messages(chat, ids=ids)
+        album = [msg for msg in messages
+                 if msg is not None and getattr(msg, 'grouped_id', None) == grouped_id]
+        album.sort(key=lambda m: m.id)
+        return album
+
+    async def _fetch_message(self, chat, msg_id):
+        """Fetch a message, batching closely-timed requests per chat
+
+        A burst of reaction events (e.g. catching up after a reconnect)
+        would otherwise cost one get_messages RPC per message. Requests
+        arriving within a 50 ms window are coalesced into a single call;
+        Telethon splits oversized ID lists into 100-ID requests itself.
+        """
+        chat_id = getattr(chat, 'id', chat)
+        entry = self._pending_fetches.get(chat_id)
+        if entry is None:
+            entry = self._pending_fetches[chat_id] = (chat, {})
+        futures = entry[1]
+
+        future = futures.get(msg_id)
+        if future is None:
+            future = futures[msg_id] = asyncio.get_running_loop().create_future()
+
+        if self._fetch_flush_task is None or self._fetch_flush_task.done():
+            self._fetch_flush_task = asyncio.create_task(self._flush_fetches())
+
+        return await future
+
+    async def _flush_fetches(self):
+        """Resolve all queued message fetches with one RPC per chat
+
+        Loops until the pending dict stays empty: a fetch queued while a
+        batch is mid-RPC sees this task as still running and doesn't spawn
+        a new one, so it must be picked up here or it would hang forever.
+        """
+        while self._pending_fetches:
+            await asyncio.sleep(0.05)
+            pending, self._pending_fetches = self._pending_fetches, {}
+
+            for chat, futures in pending.values():
+                try:
+                    messages = await self.client.get_messages(chat, ids=list(futures))
+                except Exception as e:
+                    for future in futures.values():
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                if not isinstance(messages, list):
+                    messages = [messages]
+                by_id = {m.id: m for m in messages if m}
+
+                for msg_id, future in futures.items():
+                    if not future.done():
+                        future.set_result(by_id.get(msg_id))
+
+    @staticmethod
+    def _peek_size(path):
+        """Stat a path, returning its size or -1 if it doesn't exist
+
+        One syscall replacing the exists()/stat() pair; callers run it
+        off the event loop since stat can block on network filesystems.
+        """
+        try:
+            return os.stat(path).st_size
+        except FileNotFoundError:
+            return -1
+
+    def _finalize_download(self, file_path):
+        """Post-download step, executed in the finalize thread pool
+
+        Returns the on-disk size of the finished file, or -1 if it is
+        missing. CPU- or I/O-heavy post-processing belongs here so the
+        event loop stays responsive to new reactions.
+        """
+        return self._peek_size(file_path)
+
+    async def download_media(self, message, chat_title, message_key=None):
         """Download media from a message (handles multiple files)"""
         # Check if message has media
         if not message.media:
             self.logger.debug(f"Message {message.id} has no media")
             return False
-        
+
         # Check if message has grouped media (album)
         downloaded_any = False
-        
+
         try:
             # Try to get all media in the message (for albums/groups)
-            if hasattr(message, 'grouped_id') and message.grouped_id:
+            if getattr(message, 'grouped_id', None):
                 self.logger.debug(f"Message is part of a media group (grouped_id: {message.grouped_id})")
-            
+
             # Handle single media or first item in group
             downloaded = await self._download_single_media(message, message.media, chat_title)
             if downloaded:
                 downloaded_any = True
-            
+                # Persist only confirmed downloads so failures get retried
+                # after a restart
+                if message_key is not None:
+                    self._mark_downloaded(message_key)
+
             return downloaded_any
             
         except Exception as e:
-            self.logger.error(f"Error downloading media: {e}", exc_info=True)
+            self._log_error("Error downloading media", e)
             return False
     
+    _PER_CHAT_LIMIT = 2
+
     async def _download_single_media(self, message, media, chat_title):
         """Download a single media item with semaphore control"""
-        async with self.download_semaphore:
-            self.active_downloads += 1
-            try:
+        chat_id = getattr(message, 'chat_id', None) or 0
+        chat_semaphore = self._chat_semaphores.setdefault(
+            chat_id, asyncio.Semaphore(self._PER_CHAT_LIMIT))
+
+        async with chat_semaphore:
+            async with self.download_semaphore:
                 return await self._do_download(message, media, chat_title)
-            finally:
-                self.active_downloads -= 1
     
     async def _do_download(self, message, media, chat_title):
         """Actual download logic"""
+        from telethon.tl.types import (DocumentAttributeFilename, MessageMediaDocument,
+                                       MessageMediaPhoto)
+        from telethon.errors import FloodWaitError, RPCError
+
         try:
             # Get file information
             if isinstance(media, MessageMediaDocument):
                 document = media.document
                 
-                # Get filename
-                filename = None
-                for attr in document.attributes:
-                    if hasattr(attr, 'file_name'):
-                        filename = attr.file_name
-                        break
+                # Get filename from the typed attribute that carries it
+                filename = next(
+                    (attr.file_name for attr in document.attributes
+                     if isinstance(attr, DocumentAttributeFilename)),
+                    None)
                 
                 if not filename:
-                    # Generate filename from mime type and date
+                    # Generate filename from mime type
                     ext = document.mime_type.split('/')[-1]
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    filename = f"telegram_file_{timestamp}.{ext}"
-                
+                    filename = _generated_name('telegram_file', ext)
+
                 file_size = document.size
-                
+
             elif isinstance(media, MessageMediaPhoto):
                 # Photo
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"telegram_photo_{timestamp}.jpg"
+                filename = _generated_name('telegram_photo', 'jpg')
                 file_size = 0  # We don't have exact size for photos beforehand
                 
             else:
                 self.logger.debug(f"Unsupported media type: {type(media)}")
                 return False
             
-            # Sanitize filename
+            # Sanitize filename and compute the suffix once for all the
+            # checks below
             filename = self._sanitize_filename(filename)
+            _, sep, tail = filename.rpartition('.')
+            suffix = ('.' + tail.lower()) if sep else ''
             
             # Check if we should download this file
-            if not self._should_download(filename, file_size):
+            if not self._should_download(filename, file_size, suffix):
                 return False
             
             # Check if file already exists and is complete
             download_file_path = self.download_path / filename
-            if download_file_path.exists():
-                existing_size = download_file_path.stat().st_size
+            if filename in self._existing_files:
+                self.logger.info(f"File already downloaded: {filename}")
+                return True
+            # Safety net for files that appeared out-of-band since startup
+            existing_size = await asyncio.to_thread(self._peek_size, download_file_path)
+            if existing_size >= 0:
                 # For photos we don't know the size beforehand, so just skip if file exists
                 if file_size == 0 or existing_size == file_size:
                     self.logger.info(f"File already exists and is complete: {filename}")
@@ -342,52 +871,134 @@ class TelegramDownloader:
                 else:
                     self.logger.warning(f"File exists but incomplete: {filename} ({existing_size}/{file_size} bytes)")
                     self.logger.info(f"Deleting incomplete file and re-downloading...")
-                    download_file_path.unlink()
-            
-            # Download the file
-            queue_info = f"[{self.active_downloads}/{self.max_concurrent}]"
-            self.logger.info(f"{queue_info} Downloading from '{chat_title}': {filename} ({file_size / (1024*1024):.2f} MB)")
-            
-            # Send notification about starting download
-            await self.send_notification(f"⬇️ Downloading: {filename}\nFrom: {chat_title}")
-            
-            await message.download_media(file=str(download_file_path))
+                    await asyncio.to_thread(download_file_path.unlink)
             
-            # Verify download completed successfully
-            if download_file_path.exists():
-                actual_size = download_file_path.stat().st_size
-                if file_size > 0 and actual_size != file_size:
+            # Don't start a second download of the same filename while one
+            # is in flight - it would unlink the live .part and both would
+            # stripe into the same path
+            if filename in self._active_filenames:
+                self.logger.info(f"Skipping {filename}: download already in progress")
+                return False
+            self._active_filenames.add(filename)
+
+            try:
+                # Download the file
+                queue_info = f"[{self.active_downloads}/{self.max_concurrent}]"
+                self.logger.info(f"{queue_info} Downloading from '{chat_title}': {filename} ({file_size / _MB:.2f} MB)")
+
+                # Send notification about starting download
+                await self.send_notification(f"⬇️ Downloading: {filename}\nFrom: {chat_title}")
+
+                if file_size > 0:
+                    # Documents with a known size: parallel chunked download
+                    await self._parallel_download(message, download_file_path, file_size)
+                else:
+                    # Photos have no known size beforehand, use the serial
+                    # helper - but still write to .part and rename so an
+                    # interrupted run never leaves a truncated file at the
+                    # final path
+                    part_path = str(download_file_path) + '.part'
+                    await message.download_media(file=part_path)
+                    os.replace(part_path, str(download_file_path))
+
+                # Verify download completed successfully. This runs in the
+                # finalize pool; anything else added here (hashing, moving to
+                # another filesystem) should go through the same executor
+                loop = asyncio.get_running_loop()
+                actual_size = await loop.run_in_executor(
+                    self._finalize_pool, self._finalize_download, download_file_path)
+                if actual_size >= 0 and file_size > 0 and actual_size != file_size:
                     self.logger.error(f"Download incomplete! Expected {file_size} bytes, got {actual_size} bytes")
                     await self.send_notification(f"❌ Download failed: {filename}\nIncomplete file")
                     return False
+
+                self.logger.info(f"✓ Downloaded successfully: {filename}")
+                self._existing_files.add(filename)
+
+                # Send success notification
+                await self.send_notification(f"✅ Downloaded: {filename}")
+
+                # Import to Sonarr if enabled and it's a video file
+                if self.sonarr_enabled and suffix in _VIDEO_EXTS:
+                    self._schedule_sonarr_scan(download_file_path)
+
+                return True
+            finally:
+                self._active_filenames.discard(filename)
             
-            self.logger.info(f"✓ Downloaded successfully: {filename}")
-            
-            # Send success notification
-            await self.send_notification(f"✅ Downloaded: {filename}")
-            
-            # Import to Sonarr if enabled and it's a video file
-            if self.sonarr_enabled and download_file_path.suffix.lower() in ['.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v']:
-                await self.import_to_sonarr(download_file_path)
-            
-            return True
-            
+        except FloodWaitError as e:
+            # Routine rate limiting - a one-line warning, never a traceback
+            self.logger.warning(f"Flood-limited while downloading {chat_title}: wait {e.seconds}s")
+            return False
+        except RPCError as e:
+            self.logger.error(f"Telegram error downloading media: {e}")
+            return False
         except Exception as e:
-            self.logger.error(f"Error downloading single media: {e}", exc_info=True)
+            self._log_error("Error downloading single media", e)
             return False
     
+    @property
+    def active_downloads(self):
+        """Number of downloads currently holding the global semaphore"""
+        return self.max_concurrent - self.download_semaphore._value
+
+    _EXISTING_RESCAN_INTERVAL = 300
+
+    async def _refresh_existing_files(self):
+        """Rescan the download directory periodically
+
+        Picks up files added or removed out-of-band (manual cleanup,
+        Sonarr moving imports away) so the in-memory name cache doesn't
+        drift from what's actually on disk.
+        """
+        while True:
+            await asyncio.sleep(self._EXISTING_RESCAN_INTERVAL)
+            names = await asyncio.to_thread(os.listdir, self.download_path)
+            self._existing_files = {
+                name for name in names if not name.endswith('.part')}
+
+    async def _log_queue_depth(self):
+        """Periodically log download concurrency, for tuning the limits"""
+        while True:
+            await asyncio.sleep(30)
+            if self.active_downloads or self.download_tasks:
+                self.logger.info(
+                    f"Queue depth: {self.active_downloads} active download(s), "
+                    f"{len(self.download_tasks)} task(s) in flight")
+
     async def start(self):
         """Start the Telegram client and monitor for reactions"""
+        from telethon import events
+        from telethon.tl.types import UpdateMessageReactions
+
         await self.client.start(phone=self.phone)
         
         self.logger.info("Connected to Telegram!")
         
         # Get my user ID
-        me = await self.client.get_me()
+        me = await self._get_me()
         self.my_id = me.id
         self.logger.info(f"Logged in as: {me.first_name} (ID: {me.id})")
         self.logger.info(f"Monitoring for {self.reaction_emoji} reactions")
         self.logger.info("Press Ctrl+C to stop.")
+
+        # Resolve the monitored chats to numeric peer IDs so reaction
+        # events from other chats can be dropped before any logging or
+        # RPC work. If any entry fails to resolve, the cheap pre-filter
+        # is disabled and the per-event entity check does the filtering
+        if self.monitored_chats:
+            peer_ids = set(self._monitored_ids)
+            try:
+                for chat_ref in self.monitored_chats:
+                    if chat_ref.startswith('@'):
+                        entity = await self.client.get_entity(chat_ref)
+                        peer_ids.add(entity.id)
+                        self._entity_cache[entity.id] = entity
+                self._monitored_peer_ids = frozenset(peer_ids)
+                self.logger.info(f"Pre-filtering reactions to {len(peer_ids)} monitored chat(s)")
+            except Exception as e:
+                self.logger.warning(f"Could not resolve all monitored chats, "
+                                    f"pre-filter disabled: {e}")
         
         @self.client.on(events.NewMessage)
         async def link_handler(event):
@@ -414,15 +1025,11 @@ class TelegramDownloader:
                 if not event.message.text:
                     return
                 
-                import re
                 # Match t.me links - both public and private channels
                 # Public: https://t.me/channelname/123
                 # Private: https://t.me/c/1234567890/123
-                public_pattern = r'https?://t\.me/([^/c][^/]*)/(\d+)'
-                private_pattern = r'https?://t\.me/c/(\d+)/(\d+)'
-                
-                public_matches = re.findall(public_pattern, event.message.text)
-                private_matches = re.findall(private_pattern, event.message.text)
+                public_matches = _PUBLIC_LINK_RE.findall(event.message.text)
+                private_matches = _PRIVATE_LINK_RE.findall(event.message.text)
                 
                 if not public_matches and not private_matches:
                     return
@@ -433,7 +1040,7 @@ class TelegramDownloader:
                 for channel_username, msg_id in public_matches:
                     try:
                         # Get the channel and message
-                        target_channel = await self.client.get_entity(channel_username)
+                        target_channel = await self._get_cached_entity(channel_username)
                         target_message = await self.client.get_messages(target_channel, ids=int(msg_id))
                         
                         if not target_message:
@@ -453,7 +1060,7 @@ class TelegramDownloader:
                         # Private channels need -100 prefix
                         full_channel_id = -100 + int(channel_id) if not channel_id.startswith('-') else int(channel_id)
                         
-                        target_channel = await self.client.get_entity(full_channel_id)
+                        target_channel = await self._get_cached_entity(full_channel_id)
                         target_message = await self.client.get_messages(target_channel, ids=int(msg_id))
                         
                         if not target_message:
@@ -468,49 +1075,52 @@ class TelegramDownloader:
                         await self.send_notification(f"❌ Failed to download from link:\nt.me/c/{channel_id}/{msg_id}")
             
             except Exception as e:
-                self.logger.error(f"Error in link handler: {e}", exc_info=True)
+                self._log_error("Error in link handler", e)
         
         @self.client.on(events.Raw(types=[UpdateMessageReactions]))
         async def reaction_handler(event):
             """Handle reaction updates"""
             try:
-                self.logger.info(f"⚡ Reaction event received for message {event.msg_id}")
+                # Cheap pre-filter: ignore unmonitored chats before doing
+                # any logging, parsing or entity resolution
+                if self._monitored_peer_ids and \
+                        self._peer_id(event.peer) not in self._monitored_peer_ids:
+                    return
+
+                self.logger.debug("⚡ Reaction event received for message %s", event.msg_id)
                 
-                # Log all reactions for debugging
-                if event.reactions and event.reactions.results:
+                # Log all reactions for debugging. Guarded so the INFO
+                # path builds no strings for events we end up ignoring
+                if self.logger.isEnabledFor(logging.DEBUG) and \
+                        event.reactions and event.reactions.results:
                     for r in event.reactions.results:
-                        emoji = getattr(r.reaction, 'emoticon', 'Unknown')
-                        chosen = getattr(r, 'chosen_order', None)
-                        self.logger.info(f"  Reaction: {emoji}, chosen_order: {chosen}")
+                        self.logger.debug("  Reaction: %s, chosen_order: %s",
+                                          getattr(r.reaction, 'emoticon', 'Unknown'),
+                                          getattr(r, 'chosen_order', None))
                 
                 # Check if the reaction includes our emoji
-                if not self._has_my_reaction(event.reactions, self.reaction_emoji):
-                    self.logger.info(f"❌ No matching {self.reaction_emoji} reaction on message {event.msg_id}")
+                if not self._has_my_reaction(event.reactions):
+                    self.logger.debug("❌ No matching %s reaction on message %s",
+                                      self.reaction_emoji, event.msg_id)
                     return
                 
                 self.logger.info(f"✅ Found {self.reaction_emoji} reaction!")
                 
-                # Get the chat
-                chat = await self.client.get_entity(event.peer)
+                # Get the chat (cached after the first event per chat)
+                chat = await self._get_cached_entity(event.peer)
                 chat_title = getattr(chat, 'title', getattr(chat, 'username', str(event.peer)))
                 
                 # Check if we should monitor this chat
                 if self.monitored_chats:
                     chat_id = getattr(chat, 'id', None)
                     chat_username = getattr(chat, 'username', None)
-                    
+
                     # Check if this chat is in our monitored list
-                    should_monitor = False
-                    for monitored in self.monitored_chats:
-                        if monitored.startswith('@') and chat_username:
-                            if monitored[1:] == chat_username:
-                                should_monitor = True
-                                break
-                        elif monitored.lstrip('-').isdigit():
-                            if str(chat_id) == monitored or str(chat_id) == monitored.lstrip('-'):
-                                should_monitor = True
-                                break
-                    
+                    should_monitor = (
+                        (chat_id is not None and chat_id in self._monitored_ids)
+                        or (chat_username and chat_username.lower() in self._monitored_usernames)
+                    )
+
                     if not should_monitor:
                         self.logger.debug(f"Ignoring reaction in non-monitored chat: {chat_title}")
                         return
@@ -518,57 +1128,47 @@ class TelegramDownloader:
                 self.logger.info(f"Found {self.reaction_emoji} reaction on message {event.msg_id} in '{chat_title}'")
                 
                 # Create message key for duplicate checking
-                message_key = f"{event.peer.channel_id if hasattr(event.peer, 'channel_id') else event.peer}_{event.msg_id}"
+                message_key = self._message_key(event.peer, event.msg_id)
                 
                 # Check if already downloaded
                 if message_key in self.downloaded_messages:
                     self.logger.info(f"⏭️  Message {event.msg_id} already processed, skipping")
                     return
                 
-                # Get the actual message
-                messages = await self.client.get_messages(chat, ids=event.msg_id)
-                if not messages:
+                # Get the actual message (batched with other concurrent fetches)
+                message = await self._fetch_message(chat, event.msg_id)
+                if not message:
                     self.logger.warning(f"Could not fetch message {event.msg_id}")
                     return
                 
-                message = messages[0] if isinstance(messages, list) else messages
-                
                 # Check if this message is part of a media group
-                if hasattr(message, 'grouped_id') and message.grouped_id:
+                if getattr(message, 'grouped_id', None):
                     self.logger.info(f"Message is part of a media group (grouped_id: {message.grouped_id})")
                     self.logger.info("Fetching all files in the group...")
                     
-                    # Find all messages with the same grouped_id
-                    # Search around the target message
-                    min_id = max(1, event.msg_id - 50)
-                    max_id = event.msg_id + 50
-                    
-                    grouped_messages = []
-                    async for msg in self.client.iter_messages(chat, min_id=min_id, max_id=max_id, limit=None):
-                        if hasattr(msg, 'grouped_id') and msg.grouped_id == message.grouped_id:
-                            grouped_messages.append(msg)
-                    
-                    # Sort by message ID
-                    grouped_messages.sort(key=lambda m: m.id)
+                    # Find all messages with the same grouped_id in one
+                    # batched fetch around the target message
+                    grouped_messages = await self._fetch_album(
+                        chat, event.msg_id, message.grouped_id)
                     
                     self.logger.info(f"Found {len(grouped_messages)} files in the group")
                     
                     # Start downloads as background tasks (non-blocking)
                     download_tasks = []
                     for msg in grouped_messages:
-                        msg_key = f"{event.peer.channel_id if hasattr(event.peer, 'channel_id') else event.peer}_{msg.id}"
-                        
+                        msg_key = self._message_key(event.peer, msg.id)
+
                         # Skip if already downloaded
                         if msg_key in self.downloaded_messages:
                             self.logger.debug(f"Message {msg.id} already downloaded")
                             continue
-                        
+
                         # Mark as in-progress to avoid duplicate downloads
                         self.downloaded_messages.add(msg_key)
-                        
+
                         # Create download task (non-blocking)
-                        task = asyncio.create_task(self.download_media(msg, chat_title))
-                        download_tasks.append(task)
+                        download_tasks.append(
+                            self._spawn(self.download_media(msg, chat_title, message_key=msg_key)))
                     
                     self.logger.info(f"Started {len(download_tasks)} download tasks")
                     
@@ -578,15 +1178,30 @@ class TelegramDownloader:
                 else:
                     # Single file - start download as background task
                     self.downloaded_messages.add(message_key)
-                    asyncio.create_task(self.download_media(message, chat_title))
+                    self._spawn(self.download_media(message, chat_title, message_key=message_key))
                     self.logger.info(f"Started download task")
                 
             except Exception as e:
-                self.logger.error(f"Error in reaction handler: {e}", exc_info=True)
+                self._log_error("Error in reaction handler", e)
         
+        # Periodic maintenance tasks. Not tracked in download_tasks since
+        # they never finish on their own; they're cancelled before the drain
+        metrics_task = asyncio.create_task(self._log_queue_depth())
+        rescan_task = asyncio.create_task(self._refresh_existing_files())
+
         # Keep the client running
         await self.client.run_until_disconnected()
 
+        metrics_task.cancel()
+        rescan_task.cancel()
+
+        # Let any in-flight downloads finish before shutting down
+        if self.download_tasks:
+            self.logger.info(f"Waiting for {len(self.download_tasks)} download(s) to finish...")
+            await asyncio.gather(*self.download_tasks, return_exceptions=True)
+
+        await self.aclose()
+
 
 def main():
     """Main entry point"""
@@ -599,7 +1214,14 @@ def main():
     
     # Create downloader instance
     downloader = TelegramDownloader()
-    
+
+    # Use uvloop when available - same asyncio API, faster event loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         # Run the downloader
         asyncio.run(downloader.start())
@@ -610,6 +1232,11 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Flush queued log records before the process exits - on Ctrl+C
+        # the daemon listener thread would otherwise die with the final
+        # shutdown messages still queued
+        downloader._log_listener.stop()
 
 
 if __name__ == '__main__':